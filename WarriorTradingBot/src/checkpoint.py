@@ -0,0 +1,149 @@
+"""Periodic checkpoints of live in-memory state for warm restarts.
+
+A checkpoint is a small binary file made of a fixed header followed by a
+:mod:`marshal` payload of plain Python containers (dicts, lists, strings,
+floats, ints and bools)::
+
+    magic (4s) | format version (H) | payload CRC32 (I) | payload length (I) | payload
+
+Files are written to a temporary sibling, fsynced and moved into place with
+:func:`os.replace`, so a crash mid-write leaves the previous checkpoint intact.
+Each state carries a :func:`session_identity` so that a checkpoint from an
+earlier trading day or a rotated feed file is not restored.
+"""
+
+from __future__ import annotations
+
+import datetime
+import marshal
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CHECKPOINT_FILE = "state.ckpt"
+"""str: File name of the checkpoint inside ``config.CHECKPOINT_DIR``."""
+
+_MAGIC = b"WTCK"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHII")
+
+
+def checkpoint_path(directory: str | Path) -> Path:
+    """Return the checkpoint file location inside ``directory``."""
+
+    return Path(directory) / CHECKPOINT_FILE
+
+
+def session_identity(feed_file: Optional[str | Path]) -> Dict[str, Any]:
+    """Return the trading date and feed file identity that state belongs to.
+
+    The feed file is identified by absolute path and inode, so a file that
+    was rotated and recreated under the same name does not match.
+    """
+
+    identity: Dict[str, Any] = {"date": datetime.date.today().isoformat(), "feed_file": None, "feed_inode": None}
+    if feed_file:
+        path = os.path.abspath(feed_file)
+        identity["feed_file"] = path
+        try:
+            identity["feed_inode"] = os.stat(path).st_ino
+        except OSError:
+            pass
+    return identity
+
+
+def is_current_session(state: Dict[str, Any], feed_file: Optional[str | Path]) -> bool:
+    """Return ``True`` if ``state`` was captured for today's session on ``feed_file``."""
+
+    return state.get("session") == session_identity(feed_file)
+
+
+def save_checkpoint(path: str | Path, state: Dict[str, Any]) -> None:
+    """Atomically write ``state`` to ``path``."""
+
+    path = Path(path)
+    payload = marshal.dumps(state)
+    header = _HEADER.pack(_MAGIC, _VERSION, zlib.crc32(payload), len(payload))
+    tmp_path = path.with_name(path.name + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(tmp_path, "wb") as handle:
+        handle.write(header)
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str | Path) -> Optional[Dict[str, Any]]:
+    """Return the state stored at ``path``, or ``None`` if it is missing or invalid."""
+
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < _HEADER.size:
+        logger.warning("Ignoring truncated checkpoint %s", path)
+        return None
+    magic, version, crc, length = _HEADER.unpack_from(data)
+    payload = data[_HEADER.size :]
+    if magic != _MAGIC or version != _VERSION:
+        logger.warning("Ignoring checkpoint %s with unknown format", path)
+        return None
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        logger.warning("Ignoring corrupt checkpoint %s", path)
+        return None
+
+    try:
+        state = marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        state = None
+    if not isinstance(state, dict):
+        logger.warning("Ignoring checkpoint %s without a state mapping", path)
+        return None
+    return state
+
+
+class Checkpointer:
+    """Write the state returned by ``collect`` to ``path`` on a background thread."""
+
+    def __init__(self, path: str | Path, collect: Callable[[], Dict[str, Any]], interval: float = 5.0) -> None:
+        self.path = Path(path)
+        self.collect = collect
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Begin writing a checkpoint every ``interval`` seconds."""
+
+        self._thread = threading.Thread(target=self._run, name="checkpointer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread and write a final checkpoint."""
+
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.write()
+
+    def write(self) -> None:
+        """Collect and save the current state immediately."""
+
+        try:
+            save_checkpoint(self.path, self.collect())
+        except (OSError, ValueError) as exc:
+            logger.error("Failed to write checkpoint %s: %s", self.path, exc)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.write()
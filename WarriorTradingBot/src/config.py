@@ -24,6 +24,18 @@ RISK_PER_TRADE = 0.05
 DAILY_MAX_LOSS = 0.10
 """float: Daily drawdown limit that forces the system to halt trading."""
 
+FEED_WORKERS = 0
+"""int: Worker processes parsing the file data feed; 0 keeps the single watcher thread."""
+
+FEED_SLOTS_PER_WORKER = 4096
+"""int: Maximum number of symbols each sharded feed worker can publish."""
+
+CHECKPOINT_DIR = None
+"""Optional[str]: Directory for warm-restart checkpoints; ``None`` disables them."""
+
+CHECKPOINT_INTERVAL = 5.0
+"""float: Seconds between background checkpoint writes."""
+
 MACD_FAST = 12
 MACD_SLOW = 26
 MACD_SIGNAL = 9
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
 
+from . import checkpoint
 from . import config
 from . import scanner
 from .strategy.gap_and_go import GapAndGoStrategy
@@ -23,6 +25,11 @@ def main() -> None:
     4. Relay orders through the NinjaTrader connector when signals trigger.
     5. Halt trading if the risk manager indicates daily limits have been reached.
 
+    When ``config.CHECKPOINT_DIR`` is set, market data, risk counters, and the
+    watchlist are restored from the latest checkpoint of the current session
+    before the data feed starts, the feed catches up from the checkpointed offset, and a background
+    thread keeps writing fresh checkpoints until the loop exits.
+
     Actual data ingestion, scheduling, and order-routing integrations remain TODOs for future work.
     """
 
@@ -35,18 +42,64 @@ def main() -> None:
 
     logger.info("Starting Warrior Trading agent scaffold.")
 
-    watchlist: List[str] = scanner.scan_premarket()
+    checkpoint_dir = getattr(config, "CHECKPOINT_DIR", None)
+    feed_file = getattr(config, "DATA_FEED_FILE", None)
+    restored: Optional[Dict[str, Any]] = None
+    if checkpoint_dir:
+        started = time.perf_counter()
+        restored = checkpoint.load_checkpoint(checkpoint.checkpoint_path(checkpoint_dir))
+        if restored is not None and not checkpoint.is_current_session(restored, feed_file):
+            logger.warning("Ignoring checkpoint from a different session: %s", restored.get("session"))
+            restored = None
+        if restored is not None:
+            risk_manager.set_state(restored.get("risk", {}))
+            scanner.init_data_feed(start_offset=restored.get("feed_offset"), seed=restored.get("market_data"))
+            logger.info(
+                "Restored checkpoint from %s in %.3fs.",
+                time.strftime("%H:%M:%S", time.localtime(restored.get("created", 0))),
+                time.perf_counter() - started,
+            )
+        else:
+            scanner.init_data_feed()
+
+    watchlist: List[str] = list(restored.get("watchlist", [])) if restored else []
+    watchlist.extend(symbol for symbol in scanner.scan_premarket() if symbol not in watchlist)
     logger.info("Premarket watchlist: %s", watchlist)
 
-    # TODO: Implement live data loop. For now we simply log the intended actions.
-    logger.info("Transitioning to live trading window from %s to %s EST.", config.TRADING_START_HOUR, config.TRADING_END_HOUR)
-    logger.info("Strategies loaded: %s", [strategy.__class__.__name__ for strategy in strategies])
-
-    if risk_manager.check_should_halt():
-        logger.warning("Risk limits breached on startup; halting trading loop.")
-        return
-
-    logger.info("Trading loop placeholder complete.")
+    checkpointer: Optional[checkpoint.Checkpointer] = None
+    if checkpoint_dir:
+
+        def collect_state() -> Dict[str, Any]:
+            feed_offset, market_data = scanner.snapshot_market_data()
+            return {
+                "created": time.time(),
+                "session": checkpoint.session_identity(feed_file),
+                "feed_offset": feed_offset,
+                "market_data": market_data,
+                "risk": risk_manager.get_state(),
+                "watchlist": list(watchlist),
+            }
+
+        checkpointer = checkpoint.Checkpointer(
+            checkpoint.checkpoint_path(checkpoint_dir),
+            collect_state,
+            getattr(config, "CHECKPOINT_INTERVAL", 5.0),
+        )
+        checkpointer.start()
+
+    try:
+        # TODO: Implement live data loop. For now we simply log the intended actions.
+        logger.info("Transitioning to live trading window from %s to %s EST.", config.TRADING_START_HOUR, config.TRADING_END_HOUR)
+        logger.info("Strategies loaded: %s", [strategy.__class__.__name__ for strategy in strategies])
+
+        if risk_manager.check_should_halt():
+            logger.warning("Risk limits breached on startup; halting trading loop.")
+            return
+
+        logger.info("Trading loop placeholder complete.")
+    finally:
+        if checkpointer is not None:
+            checkpointer.stop()
 
 
 if __name__ == "__main__":
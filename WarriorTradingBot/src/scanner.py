@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
+import atexit
 import json
+import multiprocessing
+import os
 import threading
-import time
-from typing import Dict, List
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from . import config
+from .shared_feed import ShardedFeed, merge_quote
 from .utils.logger import get_logger
 
 # Module-level logger for scanner activity
 logger = get_logger(__name__)
 
 # Thread-safe storage for the latest market metrics keyed by ticker symbol.
-market_data: Dict[str, Dict[str, float]] = {}
+# When sharded ingestion is enabled this is rebound to the read-only
+# :class:`~.shared_feed.SharedMarketData` view over the worker processes.
+market_data: Mapping[str, Dict[str, float]] = {}
 
 # Lock used to guard concurrent access to ``market_data`` when background
 # threads update it via the data feed bridge.
@@ -23,8 +28,19 @@ data_lock = threading.Lock()
 # Minimum gap percentage expressed as a decimal (5% by default).
 MIN_GAP_RATIO = 0.05
 
+# Worker pool backing ``market_data`` when ``config.FEED_WORKERS`` is set.
+sharded_feed: Optional[ShardedFeed] = None
 
-def _init_data_feed() -> None:
+# Byte offset into the file feed up to which every line has been merged into
+# ``market_data`` by the watcher thread.
+feed_offset = 0
+
+# Single-threaded file watcher and the event that stops it, if one is running.
+_watcher_thread: Optional[threading.Thread] = None
+_watcher_stop = threading.Event()
+
+
+def init_data_feed(start_offset: Optional[int] = None, seed: Optional[Mapping[str, Dict[str, Any]]] = None) -> None:
     """Set up the bridge that populates :data:`market_data` with live quotes.
 
     The project supports two bridge patterns, both of which remain partially
@@ -35,53 +51,162 @@ def _init_data_feed() -> None:
       and pass each message to :func:`_handle_data_message`.
     * File-based bridge – NinjaTrader (or a simulator) appends JSON lines to a
       file on disk. We spawn a watcher thread that tails the file and parses the
-      payloads in near real-time.
+      payloads in near real-time, or, when ``config.FEED_WORKERS`` is positive,
+      hand the file to a :class:`~.shared_feed.ShardedFeed` that parses it in
+      that many worker processes.
+
+    ``seed`` pre-populates :data:`market_data` (e.g. from a checkpoint) and
+    ``start_offset`` resumes the file feed from that byte offset instead of its
+    end, replaying the lines written since the seed was captured.
     """
 
-    if getattr(config, "USE_WEBSOCKET", False):
+    global market_data, sharded_feed, feed_offset, _watcher_thread, _watcher_stop
+
+    if multiprocessing.parent_process() is not None:
+        # Feed workers re-import this module under the spawn start method;
+        # only the main process owns the bridge.
+        return
+
+    use_websocket = getattr(config, "USE_WEBSOCKET", False)
+    feed_file = getattr(config, "DATA_FEED_FILE", None)
+    workers = getattr(config, "FEED_WORKERS", 0)
+    if seed and (use_websocket or not feed_file or workers <= 0):
+        # Only the sharded feed consumes the seed itself.
+        with data_lock:
+            for symbol, quote in seed.items():
+                market_data[symbol] = dict(quote)
+
+    if use_websocket:
         logger.info("Initializing WebSocket data feed bridge (TODO implementation)...")
         # TODO: Spin up a WebSocket server and invoke ``_handle_data_message``
         # for every payload received from NinjaTrader.
-    elif getattr(config, "DATA_FEED_FILE", None):
-        feed_file = getattr(config, "DATA_FEED_FILE")
+    elif feed_file:
+        if workers > 0:
+            logger.info("Initializing sharded data feed from %s across %s workers", feed_file, workers)
+            sharded_feed = ShardedFeed(
+                feed_file,
+                workers,
+                getattr(config, "FEED_SLOTS_PER_WORKER", 4096),
+                start_offset=start_offset,
+                seed=seed,
+            )
+            sharded_feed.start()
+            atexit.register(sharded_feed.stop)
+            market_data = sharded_feed.market_data
+            return
         logger.info("Initializing file-based data feed from %s", feed_file)
-        thread = threading.Thread(target=_watch_data_file, args=(feed_file,), daemon=True)
-        thread.start()
+        # Resolve the starting offset before the watcher thread runs so that a
+        # checkpoint taken in the meantime never records offset 0.
+        if start_offset is not None:
+            start_offset = _replay_data_file(feed_file, start_offset)
+        else:
+            try:
+                start_offset = os.path.getsize(feed_file)
+            except OSError:
+                start_offset = None  # the watcher logs the missing file
+        feed_offset = start_offset or 0
+        _watcher_stop = threading.Event()
+        _watcher_thread = threading.Thread(
+            target=_watch_data_file, args=(feed_file, start_offset, _watcher_stop), daemon=True
+        )
+        _watcher_thread.start()
     else:
         logger.warning("No data feed configured; scanner will operate on static data only.")
 
 
-def _watch_data_file(filepath: str) -> None:
+def stop_data_feed() -> None:
+    """Stop the file watcher thread or sharded workers started by :func:`init_data_feed`."""
+
+    global _watcher_thread
+
+    if _watcher_thread is not None:
+        _watcher_stop.set()
+        _watcher_thread.join()
+        _watcher_thread = None
+    if sharded_feed is not None:
+        sharded_feed.stop()
+
+
+def _replay_data_file(filepath: str, start_offset: int) -> int:
+    """Merge every complete line after ``start_offset`` and return the new offset.
+
+    Used on warm restart to catch up from the feed file before the watcher
+    thread starts tailing it. An offset beyond the end of the file (e.g. the
+    feed was rotated) falls back to the end of the file.
+    """
+
+    offset = start_offset
+    try:
+        with open(filepath, "rb") as handle:
+            end = handle.seek(0, 2)
+            if offset > end:
+                logger.warning("Feed offset %s is past the end of %s; skipping catch-up.", offset, filepath)
+                return end
+            handle.seek(offset)
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                _handle_data_line(line)
+                offset += len(line)
+    except FileNotFoundError:
+        logger.error("Data feed file not found at %s", filepath)
+    return offset
+
+
+def _watch_data_file(
+    filepath: str, start_offset: Optional[int] = None, stop_event: Optional[threading.Event] = None
+) -> None:
     """Tail ``filepath`` for JSON-encoded symbol updates.
 
     Each line is expected to be a JSON object containing the following keys:
     ``symbol``, ``price``, ``prev_close``, ``volume``, ``avg_vol``, ``float``,
     and optional boolean flags ``news``/``catalyst`` and ``runner``/
-    ``former_runner``.
+    ``former_runner``. Tailing starts at ``start_offset`` or, if it is
+    ``None``, at the end of the file, and runs until ``stop_event`` is set.
+    A line the writer has not finished yet is re-read once it is complete.
     """
 
+    global feed_offset
+
+    stop_event = stop_event or threading.Event()
+
     try:
-        with open(filepath, "r", encoding="utf-8") as handle:
-            handle.seek(0, 2)  # jump to end of file
-            while True:
+        with open(filepath, "rb") as handle:
+            if start_offset is None:
+                handle.seek(0, 2)  # jump to end of file
+            else:
+                handle.seek(start_offset)
+            position = feed_offset = handle.tell()
+            while not stop_event.is_set():
                 line = handle.readline()
-                if not line:
-                    time.sleep(0.5)
-                    continue
-
-                try:
-                    payload = json.loads(line.strip())
-                except json.JSONDecodeError:
-                    logger.debug("Skipping malformed line from data feed: %s", line.strip())
+                if not line.endswith(b"\n"):
+                    # Nothing new, or a half-written line: rewind and wait for the rest.
+                    handle.seek(position)
+                    stop_event.wait(0.5)
                     continue
 
-                _handle_data_message(payload)
+                _handle_data_line(line)
+                position += len(line)
+                feed_offset = position
     except FileNotFoundError:
         logger.error("Data feed file not found at %s", filepath)
     except Exception as exc:  # pragma: no cover - defensive logging
         logger.error("Unexpected error while watching data file %s: %s", filepath, exc)
 
 
+def _handle_data_line(line: bytes) -> None:
+    """Decode one raw feed line and merge it into :data:`market_data`."""
+
+    try:
+        payload = json.loads(line.strip())
+    except ValueError:
+        logger.debug("Skipping malformed line from data feed: %r", line.strip())
+        return
+
+    if isinstance(payload, dict):
+        _handle_data_message(payload)
+
+
 def _handle_data_message(message: Dict[str, object]) -> None:
     """Merge an incoming message into :data:`market_data`."""
 
@@ -90,22 +215,24 @@ def _handle_data_message(message: Dict[str, object]) -> None:
         return
 
     with data_lock:
-        entry = market_data.setdefault(symbol, {})
-        entry.update(
-            {
-                "price": float(message.get("price", entry.get("price", 0.0))),
-                "prev_close": float(message.get("prev_close", entry.get("prev_close", 0.0))),
-                "volume": float(message.get("volume", entry.get("volume", 0.0))),
-                "avg_vol": float(message.get("avg_vol", entry.get("avg_vol", 1.0))),
-                "float": float(message.get("float", entry.get("float", 0.0))),
-                "news": bool(message.get("news") or message.get("catalyst")),
-                "runner": bool(message.get("runner") or message.get("former_runner")),
-            }
-        )
+        merge_quote(market_data.setdefault(symbol, {}), message)
 
     logger.debug("Market data update for %s: %s", symbol, market_data[symbol])
 
 
+def snapshot_market_data() -> Tuple[int, Dict[str, Dict[str, Any]]]:
+    """Return the feed offset and a copy of :data:`market_data` for checkpointing.
+
+    The offset is read before the quotes are copied, so replaying the feed
+    from it onto the copy reproduces the live state.
+    """
+
+    with data_lock:
+        offset = sharded_feed.offset() if sharded_feed is not None else feed_offset
+        data = {symbol: dict(quote) for symbol, quote in market_data.items()}
+    return offset, data
+
+
 def _qualifies(symbol: str, data: Dict[str, float]) -> bool:
     """Return ``True`` if ``symbol`` satisfies the Warrior Trading filters."""
 
@@ -209,6 +336,8 @@ def _log_qualification(stage: str, symbol: str, data: Dict[str, float]) -> None:
 
 
 # Kick off the data feed bridge when the module is imported so that external
-# callers receive live updates without manual initialization.
-_init_data_feed()
+# callers receive live updates without manual initialization. With checkpoints
+# enabled :func:`main.main` starts it instead, after restoring saved state.
+if not getattr(config, "CHECKPOINT_DIR", None):
+    init_data_feed()
 
@@ -0,0 +1,514 @@
+"""Sharded, multi-process ingestion of the quote feed into shared memory.
+
+The single-threaded watcher in :mod:`scanner` parses and merges every quote
+under the GIL, which limits ingestion to one core during the open. This module
+hash-partitions symbols across worker processes. Each worker tails the feed,
+fully parses only the lines that belong to its shard, and writes the merged
+quote into a :mod:`multiprocessing.shared_memory` region. The main process
+reads the region through :class:`SharedMarketData`, a read-only mapping with
+the same shape as :data:`scanner.market_data`.
+
+Region layout (all integers are signed 64-bit, all fields 64-bit floats)::
+
+    header   per shard: [slot count, messages processed, feed byte offset, ready]
+    seq      per slot: seqlock counter, odd while a write is in progress
+    fields   per slot: FIELDS in order
+    names    per slot: SYMBOL_WIDTH bytes of NUL-padded UTF-8
+
+Shard ``k`` owns slots ``[k * slots_per_worker, (k + 1) * slots_per_worker)``
+and is the only writer for them, so no cross-process locks are needed. A slot
+is published by writing its name and fields before bumping the shard's slot
+count; readers retry a slot whose seqlock changed while they were copying it.
+
+Every worker still has to skip the lines owned by other shards, so that cost
+is kept minimal: the feed is read in large chunks, the symbol pattern is run
+over the whole chunk, and only lines whose symbol maps to the worker's shard
+are split out and decoded. Lines whose symbol cannot be read from the raw
+bytes (JSON escapes, non-string values) are decoded by every worker, and the
+owner is chosen from the decoded symbol.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import re
+import time
+import zlib
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FIELDS: Tuple[str, ...] = ("price", "prev_close", "volume", "avg_vol", "float", "news", "runner")
+"""tuple: Per-symbol quote fields stored in each shared slot, in slot order."""
+
+SYMBOL_WIDTH = 16
+"""int: Bytes reserved for each UTF-8 encoded ticker symbol in the shared region."""
+
+_HEADER_WIDTH = 4
+_BOOL_FIELDS = frozenset({"news", "runner"})
+_READ_SIZE = 1 << 20
+_MAX_READ_RETRIES = 10_000
+
+# Cheap pre-filter so workers only run ``json.loads`` on lines from their shard.
+# Every ``"symbol"`` occurrence matches; group 1 is the raw string value when
+# there is one, and is ``None`` for values that need a full parse to resolve.
+_SYMBOL_RE = re.compile(rb'"symbol"(?:\s*:\s*"((?:[^"\\]|\\.)*)")?')
+
+
+def merge_quote(entry: Dict[str, Any], message: Mapping[str, Any]) -> Dict[str, Any]:
+    """Merge the fields of ``message`` into ``entry`` in place and return it.
+
+    Missing numeric fields keep their previous value; the boolean catalyst
+    flags reflect the latest message only.
+    """
+
+    entry.update(
+        {
+            "price": float(message.get("price", entry.get("price", 0.0))),
+            "prev_close": float(message.get("prev_close", entry.get("prev_close", 0.0))),
+            "volume": float(message.get("volume", entry.get("volume", 0.0))),
+            "avg_vol": float(message.get("avg_vol", entry.get("avg_vol", 1.0))),
+            "float": float(message.get("float", entry.get("float", 0.0))),
+            "news": bool(message.get("news") or message.get("catalyst")),
+            "runner": bool(message.get("runner") or message.get("former_runner")),
+        }
+    )
+    return entry
+
+
+def shard_for(symbol: str, workers: int) -> int:
+    """Return the shard index that owns ``symbol``.
+
+    ``zlib.crc32`` is used instead of :func:`hash` because string hashing is
+    randomized per process and every worker must agree on the partition.
+    """
+
+    return zlib.crc32(symbol.encode("utf-8")) % workers
+
+
+class _Layout:
+    """Typed views over a shared memory buffer using the module layout."""
+
+    def __init__(self, buf: memoryview, workers: int, slots_per_worker: int) -> None:
+        total = workers * slots_per_worker
+        header_end = workers * _HEADER_WIDTH * 8
+        seq_end = header_end + total * 8
+        fields_end = seq_end + total * len(FIELDS) * 8
+        self.header = buf[:header_end].cast("q")
+        self.seq = buf[header_end:seq_end].cast("q")
+        self.fields = buf[seq_end:fields_end].cast("d")
+        self.names = buf[fields_end : fields_end + total * SYMBOL_WIDTH]
+
+    @staticmethod
+    def size(workers: int, slots_per_worker: int) -> int:
+        total = workers * slots_per_worker
+        return (workers * _HEADER_WIDTH + total * (1 + len(FIELDS))) * 8 + total * SYMBOL_WIDTH
+
+    def release(self) -> None:
+        for view in (self.header, self.seq, self.fields, self.names):
+            view.release()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach a worker to the region created by :class:`ShardedFeed`.
+
+    The creating process owns the region and unlinks it in
+    :meth:`ShardedFeed.stop`. Workers share its resource tracker, so on Python
+    versions without the ``track`` argument a plain attach is already safe.
+    """
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13 has no ``track`` argument
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker(
+    shm_name: str,
+    shard: int,
+    workers: int,
+    slots_per_worker: int,
+    filepath: str,
+    start_offset: Optional[int],
+    follow: bool,
+    stop_event: Any,
+    seed: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> None:
+    """Tail ``filepath`` and publish quotes for symbols owned by ``shard``.
+
+    ``start_offset`` of ``None`` begins at the end of the file, matching the
+    single-threaded watcher. With ``follow`` disabled the worker exits at end
+    of file, which is used for replays and benchmarks. Quotes in ``seed`` that
+    belong to this shard are published before the feed is read.
+    """
+
+    shm = _attach(shm_name)
+    layout = _Layout(shm.buf, workers, slots_per_worker)
+    header, seq, fields, names = layout.header, layout.seq, layout.fields, layout.names
+    width = len(FIELDS)
+    base_slot = shard * slots_per_worker
+    header_base = shard * _HEADER_WIDTH
+    slots: Dict[str, int] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    # Raw symbol bytes -> owning shard, so skipped lines cost a dict lookup.
+    owners: Dict[bytes, int] = {}
+    # Symbols that did not fit in this shard, so the warning is logged once.
+    dropped: set = set()
+    processed = 0
+
+    def publish(symbol: str, message: Mapping[str, Any]) -> bool:
+        try:
+            entry = merge_quote(dict(entries.get(symbol, {})), message)
+        except (TypeError, ValueError) as exc:
+            logger.debug("Skipping invalid quote for %s: %s", symbol, exc)
+            return False
+
+        slot = slots.get(symbol)
+        is_new = slot is None
+        if slot is None:
+            encoded = symbol.encode("utf-8")
+            if len(slots) >= slots_per_worker or len(encoded) > SYMBOL_WIDTH:
+                if symbol not in dropped:
+                    dropped.add(symbol)
+                    logger.warning("Shard %s cannot store symbol %s; dropping its updates.", shard, symbol)
+                return False
+            slot = base_slot + len(slots)
+            names[slot * SYMBOL_WIDTH : (slot + 1) * SYMBOL_WIDTH] = encoded.ljust(SYMBOL_WIDTH, b"\0")
+            slots[symbol] = slot
+        entries[symbol] = entry
+
+        field_base = slot * width
+        seq[slot] += 1
+        for index, name in enumerate(FIELDS):
+            fields[field_base + index] = float(entry[name])
+        seq[slot] += 1
+
+        if is_new:
+            header[header_base] = len(slots)
+        return True
+
+    def process(data: bytes, end: int) -> int:
+        """Publish owned quotes among the complete lines in ``data[:end]``."""
+
+        published = 0
+        line_end = 0
+        for match in _SYMBOL_RE.finditer(data, 0, end):
+            start = match.start()
+            if start < line_end:
+                continue  # a second "symbol" key on a line already handled
+            raw = match.group(1)
+            if raw is not None and b"\\" not in raw:
+                owner = owners.get(raw)
+                if owner is None:
+                    owner = owners[raw] = zlib.crc32(raw) % workers
+                if owner != shard:
+                    continue
+            # Otherwise the owner is only known after decoding the line below.
+
+            line_start = data.rfind(b"\n", 0, start) + 1
+            line_end = data.find(b"\n", start) + 1 or end
+            line = data[line_start:line_end]
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                logger.debug("Skipping malformed line from data feed: %r", line.strip())
+                continue
+            if not isinstance(payload, dict):
+                continue
+            symbol = payload.get("symbol")
+            if not isinstance(symbol, str) or shard_for(symbol, workers) != shard:
+                continue
+            if publish(symbol, payload):
+                published += 1
+        return published
+
+    for symbol, quote in (seed or {}).items():
+        if shard_for(symbol, workers) == shard:
+            publish(symbol, quote)
+    header[header_base + 3] = 1
+
+    try:
+        with open(filepath, "rb") as handle:
+            if start_offset is None:
+                handle.seek(0, 2)
+            else:
+                handle.seek(start_offset)
+            offset = handle.tell()
+            pending = b""
+
+            while True:
+                # Publish the offset before reading the next chunk so that it
+                # never runs ahead of the quotes already merged.
+                header[header_base + 2] = offset
+                if stop_event.is_set():
+                    break
+                chunk = handle.read(_READ_SIZE)
+                if not chunk:
+                    if not follow:
+                        if pending:
+                            processed += process(pending + b"\n", len(pending) + 1)
+                            offset += len(pending)
+                        break
+                    time.sleep(0.5)
+                    continue
+
+                data = pending + chunk if pending else chunk
+                end = data.rfind(b"\n") + 1
+                # Keep any unfinished trailing line until the writer completes it.
+                pending = data[end:]
+                if end:
+                    processed += process(data, end)
+                    offset += end
+                    header[header_base + 1] = processed
+            header[header_base + 1] = processed
+            header[header_base + 2] = offset
+    except FileNotFoundError:
+        logger.error("Data feed file not found at %s", filepath)
+    finally:
+        layout.release()
+        shm.close()
+
+
+class SharedMarketData(Mapping[str, Dict[str, Any]]):
+    """Read-only mapping of symbol to quote backed by the shared region.
+
+    Lookups read the slot in place and return a fresh dict with the same keys
+    as :data:`scanner.market_data` entries. Each returned quote is a
+    consistent snapshot of a single worker write.
+    """
+
+    def __init__(self, layout: _Layout, workers: int, slots_per_worker: int) -> None:
+        self._layout = layout
+        self._workers = workers
+        self._slots_per_worker = slots_per_worker
+        self._known: List[int] = [0] * workers
+        self._slots: Dict[str, int] = {}
+
+    def _refresh(self) -> None:
+        """Pick up symbols published since the last call."""
+
+        header, names = self._layout.header, self._layout.names
+        for shard in range(self._workers):
+            count = header[shard * _HEADER_WIDTH]
+            known = self._known[shard]
+            if count == known:
+                continue
+            base_slot = shard * self._slots_per_worker
+            for slot in range(base_slot + known, base_slot + count):
+                raw = bytes(names[slot * SYMBOL_WIDTH : (slot + 1) * SYMBOL_WIDTH])
+                self._slots[raw.rstrip(b"\0").decode("utf-8")] = slot
+            self._known[shard] = count
+
+    def _read(self, slot: int) -> Dict[str, Any]:
+        seq = self._layout.seq
+        width = len(FIELDS)
+        for _ in range(_MAX_READ_RETRIES):
+            before = seq[slot]
+            values = self._layout.fields[slot * width : (slot + 1) * width].tolist()
+            if not before & 1 and seq[slot] == before:
+                break
+        else:
+            # The writer died mid-update (e.g. terminated by ``stop``); the
+            # slot will never settle, so serve the last fields as stale.
+            logger.debug("Returning stale quote for shared slot %s", slot)
+        quote: Dict[str, Any] = dict(zip(FIELDS, values))
+        for name in _BOOL_FIELDS:
+            quote[name] = bool(quote[name])
+        return quote
+
+    def __getitem__(self, symbol: str) -> Dict[str, Any]:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            self._refresh()
+            slot = self._slots[symbol]
+        return self._read(slot)
+
+    def __iter__(self) -> Iterator[str]:
+        self._refresh()
+        return iter(list(self._slots))
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._slots)
+
+    def __contains__(self, symbol: object) -> bool:
+        if symbol not in self._slots:
+            self._refresh()
+        return symbol in self._slots
+
+
+class ShardedFeed:
+    """Own the shared region and the worker processes that populate it."""
+
+    def __init__(
+        self,
+        filepath: str,
+        workers: int,
+        slots_per_worker: int = 4096,
+        start_offset: Optional[int] = None,
+        follow: bool = True,
+        seed: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("ShardedFeed requires at least one worker")
+        self.filepath = filepath
+        self.workers = workers
+        self.slots_per_worker = slots_per_worker
+        self.start_offset = start_offset
+        self.follow = follow
+        self.seed = dict(seed or {})
+        self._shm = shared_memory.SharedMemory(create=True, size=_Layout.size(workers, slots_per_worker))
+        self._layout = _Layout(self._shm.buf, workers, slots_per_worker)
+        self.market_data = SharedMarketData(self._layout, workers, slots_per_worker)
+        self._stop_event = multiprocessing.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self, ready_timeout: float = 10.0) -> None:
+        """Launch one worker process per shard and wait until they are ready.
+
+        A worker is ready once it has published its share of the seed, so
+        :attr:`market_data` reflects the seed when this returns. A
+        ``start_offset`` of ``None`` is resolved to the current file size here
+        so that all workers, and :meth:`offset`, agree on where tailing begins.
+        """
+
+        if self.start_offset is None:
+            try:
+                self.start_offset = os.path.getsize(self.filepath)
+            except OSError:
+                self.start_offset = 0
+        header = self._layout.header
+        for shard in range(self.workers):
+            header[shard * _HEADER_WIDTH + 2] = self.start_offset
+
+        for shard in range(self.workers):
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(
+                    self._shm.name,
+                    shard,
+                    self.workers,
+                    self.slots_per_worker,
+                    self.filepath,
+                    self.start_offset,
+                    self.follow,
+                    self._stop_event,
+                    self.seed,
+                ),
+                name=f"feed-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+        deadline = time.monotonic() + ready_timeout
+        for shard, process in enumerate(self._processes):
+            while not header[shard * _HEADER_WIDTH + 3]:
+                if process.exitcode is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"Sharded feed worker {shard} failed to start")
+                time.sleep(0.01)
+        logger.info("Started %s sharded feed workers on %s", self.workers, self.filepath)
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait for the workers to exit (only returns early when ``follow`` is off)."""
+
+        for process in self._processes:
+            process.join(timeout)
+
+    def processed(self) -> int:
+        """Return the total number of quotes merged across all shards."""
+
+        header = self._layout.header
+        return sum(header[shard * _HEADER_WIDTH + 1] for shard in range(self.workers))
+
+    def offset(self) -> int:
+        """Return the feed byte offset that every shard has fully merged.
+
+        Replaying the feed from this offset onto a snapshot of
+        :attr:`market_data` reproduces the live state, because each quote
+        merge overwrites fields with the latest value.
+        """
+
+        header = self._layout.header
+        return min(header[shard * _HEADER_WIDTH + 2] for shard in range(self.workers))
+
+    def stop(self) -> None:
+        """Stop the workers and release the shared region; later calls do nothing."""
+
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+        self._layout.release()
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _write_synthetic_feed(filepath: str, messages: int, symbols: int) -> None:
+    """Write ``messages`` JSON quote lines spread over ``symbols`` tickers."""
+
+    tickers = [f"SYM{index:04d}" for index in range(symbols)]
+    with open(filepath, "w", encoding="utf-8") as handle:
+        for index in range(messages):
+            handle.write(
+                json.dumps(
+                    {
+                        "symbol": tickers[index % symbols],
+                        "price": 2.0 + (index % 500) / 100,
+                        "prev_close": 2.0,
+                        "volume": 1000 * index,
+                        "avg_vol": 50_000,
+                        "float": 5_000_000,
+                        "news": index % 3 == 0,
+                    }
+                )
+            )
+            handle.write("\n")
+
+
+def benchmark(max_workers: int = 4, messages: int = 400_000, symbols: int = 512) -> Dict[int, float]:
+    """Measure replay throughput (messages/second) for 1..``max_workers`` shards.
+
+    Workers run concurrently, so the numbers only show scaling on a machine
+    with at least ``max_workers`` free cores; on fewer cores the shards share
+    CPU time and throughput stays flat. Scaling figures obtained on a single
+    core by running each shard's worker one after another and dividing by the
+    slowest shard are projections, not concurrent measurements.
+    """
+
+    import tempfile
+
+    results: Dict[int, float] = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filepath = os.path.join(tmpdir, "feed.jsonl")
+        _write_synthetic_feed(filepath, messages, symbols)
+        for workers in range(1, max_workers + 1):
+            feed = ShardedFeed(filepath, workers, start_offset=0, follow=False)
+            started = time.perf_counter()
+            feed.start()
+            feed.join()
+            elapsed = time.perf_counter() - started
+            processed = feed.processed()
+            feed.stop()
+            if processed != messages:
+                raise RuntimeError(f"Benchmark merged {processed} of {messages} messages with {workers} workers")
+            results[workers] = messages / elapsed
+            logger.info("%s worker(s): %.0f msgs/sec", workers, results[workers])
+    return results
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Dict
 
 
 class RiskManager:
@@ -29,3 +29,14 @@ class RiskManager:
             return True
         # Halt after three consecutive losses by default.
         return self.consecutive_losses >= 3
+
+    def get_state(self) -> Dict[str, float]:
+        """Return the loss counters for checkpointing."""
+
+        return {"daily_loss": self.daily_loss, "consecutive_losses": self.consecutive_losses}
+
+    def set_state(self, state: Dict[str, float]) -> None:
+        """Restore loss counters captured by :meth:`get_state`."""
+
+        self.daily_loss = float(state.get("daily_loss", 0.0))
+        self.consecutive_losses = int(state.get("consecutive_losses", 0))
@@ -1,31 +1,263 @@
-"""Plotting utilities for visual analysis of strategies."""
+"""Plotting utilities for visual analysis of strategies.
+
+Charts are drawn on standalone :class:`~matplotlib.figure.Figure` objects rather
+than through :mod:`matplotlib.pyplot`, so they render headlessly and can be
+produced in worker processes by :func:`render_charts`. Large inputs are reduced
+before drawing: equity curves with largest-triangle-three-buckets (LTTB)
+downsampling and candlesticks by merging adjacent bars.
+"""
 
 from __future__ import annotations
 
-from typing import Iterable
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+
+from .data_loader import load_data
+
+DEFAULT_MAX_POINTS = 2000
+"""int: Points kept when downsampling an equity curve (about two per pixel column)."""
+
+DEFAULT_MAX_BARS = 400
+"""int: Candles drawn before adjacent bars are merged."""
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+"""tuple: Column names required by :func:`plot_candlestick`."""
+
+_UP_COLOR = "#26a69a"
+_DOWN_COLOR = "#ef5350"
+
+
+@dataclass(frozen=True)
+class ChartJob:
+    """Description of one chart rendered to PNG by :func:`render_charts`.
+
+    ``kind`` is ``"equity"`` or ``"candlestick"``. ``data`` is a profit series
+    for equity curves, or an OHLCV DataFrame or CSV path for candlesticks;
+    passing a path avoids pickling large frames to the worker processes.
+    """
+
+    kind: str
+    data: Any
+    filename: str
+    title: Optional[str] = None
+
+
+def cumulative_pnl(profits: Iterable[float]) -> np.ndarray:
+    """Return the running total of ``profits`` as a float array."""
+
+    if isinstance(profits, (np.ndarray, pd.Series, list, tuple)):
+        values = np.asarray(profits, dtype=float)
+    else:
+        values = np.fromiter(profits, dtype=float)
+    return np.cumsum(values)
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce ``(x, y)`` to ``threshold`` points with the LTTB algorithm.
+
+    The first and last points are always kept. From each intermediate bucket
+    the point forming the largest triangle with the previously selected point
+    and the average of the next bucket is chosen, which preserves the visual
+    shape, including spikes, far better than uniform striding.
+    """
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # Bucket edges for the ``threshold - 2`` buckets between the fixed endpoints.
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    edges[-1] = n - 1
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[1 : n - 1], starts - 1) / sizes
+    avg_y = np.add.reduceat(y[1 : n - 1], starts - 1) / sizes
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket, (start, stop) in enumerate(zip(edges[:-1], edges[1:])):
+        bx = x[start:stop]
+        by = y[start:stop]
+        area = np.abs((x[previous] - avg_x[bucket]) * (by - y[previous]) - (x[previous] - bx) * (avg_y[bucket] - y[previous]))
+        previous = start + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return x[selected], y[selected]
+
+
+def aggregate_ohlcv(data: pd.DataFrame, max_bars: int) -> pd.DataFrame:
+    """Merge adjacent rows of ``data`` so that at most ``max_bars`` remain.
+
+    Each merged bar keeps the first open, highest high, lowest low, last close
+    and summed volume of its group, plus the first timestamp if present.
+    """
+
+    if max_bars <= 0:
+        raise ValueError(f"max_bars must be positive, got {max_bars}")
+
+    n = len(data)
+    if n <= max_bars:
+        return data
+
+    step = -(-n // max_bars)
+    starts = np.arange(0, n, step)
+    ends = np.append(starts[1:], n) - 1
+    merged = {
+        "open": data["open"].to_numpy(dtype=float)[starts],
+        "high": np.maximum.reduceat(data["high"].to_numpy(dtype=float), starts),
+        "low": np.minimum.reduceat(data["low"].to_numpy(dtype=float), starts),
+        "close": data["close"].to_numpy(dtype=float)[ends],
+        "volume": np.add.reduceat(data["volume"].to_numpy(dtype=float), starts),
+    }
+    if "timestamp" in data:
+        merged = {"timestamp": data["timestamp"].to_numpy()[starts], **merged}
+    return pd.DataFrame(merged)
+
+
+def _bar_polygons(x: np.ndarray, bottom: np.ndarray, top: np.ndarray, width: float) -> np.ndarray:
+    """Return rectangle vertices of shape ``(n, 4, 2)`` for a batch of bars."""
+
+    left = x - width / 2
+    right = x + width / 2
+    return np.stack(
+        [
+            np.column_stack([left, bottom]),
+            np.column_stack([left, top]),
+            np.column_stack([right, top]),
+            np.column_stack([right, bottom]),
+        ],
+        axis=1,
+    )
+
+
+def plot_candlestick(
+    data: pd.DataFrame,
+    max_bars: int = DEFAULT_MAX_BARS,
+    title: Optional[str] = None,
+    output_path: Optional[str | Path] = None,
+) -> Figure:
+    """Render an OHLCV candlestick chart with a volume panel.
+
+    ``data`` must provide the :data:`OHLCV_COLUMNS`; a ``timestamp`` column is
+    used for x-axis labels when present. Wicks, bodies and volume bars are each
+    drawn as a single collection, so rendering cost stays flat as bars grow.
+    The figure is saved to ``output_path`` when given and returned either way.
+    """
+
+    missing = [column for column in OHLCV_COLUMNS if column not in data]
+    if missing:
+        raise ValueError(f"OHLCV data is missing columns: {missing}")
+
+    bars = aggregate_ohlcv(data, max_bars)
+    opens = bars["open"].to_numpy(dtype=float)
+    highs = bars["high"].to_numpy(dtype=float)
+    lows = bars["low"].to_numpy(dtype=float)
+    closes = bars["close"].to_numpy(dtype=float)
+    volumes = bars["volume"].to_numpy(dtype=float)
+    x = np.arange(len(bars), dtype=float)
+    colors = np.where(closes >= opens, _UP_COLOR, _DOWN_COLOR)
+
+    figure = Figure(figsize=(10, 6))
+    price_ax, volume_ax = figure.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+
+    wicks = np.stack([np.column_stack([x, lows]), np.column_stack([x, highs])], axis=1)
+    price_ax.add_collection(LineCollection(wicks, colors=colors, linewidths=0.8))
+    bodies = _bar_polygons(x, np.minimum(opens, closes), np.maximum(opens, closes), 0.6)
+    price_ax.add_collection(PolyCollection(bodies, facecolors=colors, edgecolors=colors, linewidths=0.5))
+    price_ax.autoscale_view()
+    price_ax.set_ylabel("Price")
+    price_ax.set_title(title or "Candlestick Chart")
+
+    volume_polygons = _bar_polygons(x, np.zeros_like(volumes), volumes, 0.6)
+    volume_ax.add_collection(PolyCollection(volume_polygons, facecolors=colors, edgecolors="none"))
+    volume_ax.autoscale_view()
+    volume_ax.set_ylabel("Volume")
+
+    if "timestamp" in bars and len(bars):
+        ticks = np.unique(np.linspace(0, len(bars) - 1, num=min(len(bars), 8)).astype(int))
+        volume_ax.set_xticks(ticks)
+        volume_ax.set_xticklabels([str(label) for label in bars["timestamp"].to_numpy()[ticks]], rotation=30, ha="right")
+
+    figure.tight_layout()
+    if output_path is not None:
+        figure.savefig(output_path)
+    return figure
+
+
+def plot_equity_curve(
+    profits: Iterable[float],
+    max_points: int = DEFAULT_MAX_POINTS,
+    title: Optional[str] = None,
+    output_path: Optional[str | Path] = None,
+) -> Figure:
+    """Plot a cumulative P/L curve for the provided profit series.
+
+    The running total is computed with :func:`numpy.cumsum` and downsampled to
+    ``max_points`` with :func:`lttb_downsample` before drawing. The figure is
+    saved to ``output_path`` when given and returned either way.
+    """
+
+    cumulative = cumulative_pnl(profits)
+    x, y = lttb_downsample(np.arange(1, len(cumulative) + 1), cumulative, max_points)
+
+    figure = Figure(figsize=(10, 4))
+    ax = figure.subplots()
+    ax.plot(x, y, linewidth=1.0)
+    ax.axhline(0.0, color="grey", linewidth=0.5)
+    ax.set_xlabel("Trade")
+    ax.set_ylabel("Cumulative P/L")
+    ax.set_title(title or "Equity Curve")
+
+    figure.tight_layout()
+    if output_path is not None:
+        figure.savefig(output_path)
+    return figure
 
-import matplotlib.pyplot as plt
 
+def _render_job(job: ChartJob, output_dir: Path) -> Path:
+    """Render a single :class:`ChartJob` to ``output_dir`` and return its path."""
 
-def plot_candlestick(data) -> None:
-    """Placeholder for rendering a candlestick chart from OHLCV data."""
+    path = output_dir / job.filename
+    if job.kind == "equity":
+        plot_equity_curve(job.data, title=job.title, output_path=path)
+    elif job.kind == "candlestick":
+        data = job.data
+        if isinstance(data, (str, Path)):
+            data = load_data(data)
+            if data is None:
+                raise ValueError(f"Could not load OHLCV data for {job.filename}")
+        plot_candlestick(data, title=job.title, output_path=path)
+    else:
+        raise ValueError(f"Unknown chart kind: {job.kind}")
+    return path
 
-    # TODO: Implement using mplfinance or manual Matplotlib drawing.
-    plt.figure()
-    plt.title("Candlestick Plot TODO")
-    plt.close()
 
+def render_charts(jobs: Sequence[ChartJob], output_dir: str | Path, processes: Optional[int] = None) -> List[Path]:
+    """Render ``jobs`` to PNG files in ``output_dir`` using worker processes.
 
-def plot_equity_curve(profits: Iterable[float]) -> None:
-    """Plot a cumulative P/L curve for the provided profit series."""
+    ``processes`` defaults to the CPU count. Paths are returned in job order.
+    """
 
-    cumulative = []
-    total = 0.0
-    for profit in profits:
-        total += profit
-        cumulative.append(total)
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    if not jobs:
+        return []
 
-    plt.figure()
-    plt.plot(cumulative)
-    plt.title("Equity Curve TODO")
-    plt.close()
+    workers = processes or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_render_job, jobs, repeat(output), chunksize=chunksize))
@@ -0,0 +1,186 @@
+"""Tests for warm-restart checkpoint persistence."""
+
+import json
+import time
+
+from ..src import checkpoint, config, scanner
+
+QUALIFYING_QUOTE = {
+    "price": 5.0,
+    "prev_close": 4.0,
+    "volume": 1_000_000.0,
+    "avg_vol": 10_000.0,
+    "float": 1_000_000.0,
+    "news": True,
+    "runner": False,
+}
+
+
+def _use_feed(monkeypatch, feed_file, workers=0):
+    """Point the scanner at ``feed_file`` with fresh module state."""
+
+    monkeypatch.setattr(config, "DATA_FEED_FILE", str(feed_file), raising=False)
+    monkeypatch.setattr(config, "FEED_WORKERS", workers)
+    monkeypatch.setattr(scanner, "market_data", {})
+    monkeypatch.setattr(scanner, "sharded_feed", None)
+    monkeypatch.setattr(scanner, "feed_offset", 0)
+    monkeypatch.setattr(scanner, "_watcher_thread", None)
+
+
+def _wait_for_offset(size):
+    """Wait until the running feed has merged ``size`` bytes of the file."""
+
+    deadline = time.monotonic() + 5
+    while scanner.snapshot_market_data()[0] < size and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    """Saved state should load back unchanged."""
+
+    state = {
+        "feed_offset": 1234,
+        "market_data": {"ABCD": {"price": 4.2, "volume": 1e6, "news": True}},
+        "risk": {"daily_loss": 0.03, "consecutive_losses": 1},
+        "watchlist": ["ABCD"],
+    }
+    path = checkpoint.checkpoint_path(tmp_path)
+    checkpoint.save_checkpoint(path, state)
+
+    assert checkpoint.load_checkpoint(path) == state
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+def test_corrupt_checkpoint_is_ignored(tmp_path):
+    """A checkpoint whose payload fails the CRC check should not be restored."""
+
+    path = checkpoint.checkpoint_path(tmp_path)
+    checkpoint.save_checkpoint(path, {"watchlist": ["ABCD"]})
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    assert checkpoint.load_checkpoint(path) is None
+    assert checkpoint.load_checkpoint(tmp_path / "missing.ckpt") is None
+
+
+def test_checkpoint_from_another_session_is_rejected(tmp_path):
+    """State captured for a different date or feed file must not be restored."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    feed_file.write_text("", encoding="utf-8")
+    state = {"session": checkpoint.session_identity(feed_file)}
+    assert checkpoint.is_current_session(state, feed_file)
+
+    stale = {"session": dict(state["session"], date="2000-01-01")}
+    assert not checkpoint.is_current_session(stale, feed_file)
+
+    (tmp_path / "other.jsonl").write_text("", encoding="utf-8")
+    assert not checkpoint.is_current_session(state, tmp_path / "other.jsonl")
+
+
+def test_replay_stops_at_partial_line_and_offset_past_eof(tmp_path, monkeypatch):
+    """Catch-up merges only complete lines and ignores offsets beyond the file."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    complete = '{"symbol": "AB", "price": 2.0}\n'
+    feed_file.write_text(complete + '{"symbol": "AB", "price": 9', encoding="utf-8")
+    _use_feed(monkeypatch, feed_file)
+
+    assert scanner._replay_data_file(str(feed_file), 0) == len(complete)
+    assert scanner.market_data["AB"]["price"] == 2.0
+
+    size = feed_file.stat().st_size
+    assert scanner._replay_data_file(str(feed_file), size + 100) == size
+
+
+def test_watcher_waits_for_split_write(tmp_path, monkeypatch):
+    """A line written in two pieces is merged once complete, and the offset never lands mid-line."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    feed_file.write_text("", encoding="utf-8")
+    _use_feed(monkeypatch, feed_file)
+    scanner.init_data_feed()
+    try:
+        with open(feed_file, "a", encoding="utf-8") as handle:
+            handle.write('{"symbol": "AB", "pri')
+        time.sleep(0.7)
+        assert scanner.snapshot_market_data() == (0, {})
+
+        with open(feed_file, "a", encoding="utf-8") as handle:
+            handle.write('ce": 3.0}\n')
+        _wait_for_offset(feed_file.stat().st_size)
+        assert scanner.snapshot_market_data()[0] == feed_file.stat().st_size
+        assert scanner.market_data["AB"]["price"] == 3.0
+    finally:
+        scanner.stop_data_feed()
+
+
+def test_init_data_feed_seed_is_visible_to_scan(tmp_path, monkeypatch):
+    """A restored seed must qualify in the first scan, with or without sharding."""
+
+    for workers in (0, 2):
+        feed_file = tmp_path / f"feed{workers}.jsonl"
+        feed_file.write_text('{"symbol": "ZZ", "price": 1.0}\n', encoding="utf-8")
+        _use_feed(monkeypatch, feed_file, workers)
+
+        scanner.init_data_feed(start_offset=feed_file.stat().st_size, seed={"ABCD": QUALIFYING_QUOTE})
+        try:
+            assert scanner.scan_premarket() == ["ABCD"]
+            assert scanner.snapshot_market_data()[0] == feed_file.stat().st_size
+        finally:
+            scanner.stop_data_feed()
+
+
+def test_init_data_feed_keeps_seed_without_file_feed(monkeypatch):
+    """The seed is kept when sharding is configured but no file feed exists."""
+
+    monkeypatch.setattr(config, "DATA_FEED_FILE", None, raising=False)
+    monkeypatch.setattr(config, "FEED_WORKERS", 2)
+    monkeypatch.setattr(scanner, "market_data", {})
+    monkeypatch.setattr(scanner, "sharded_feed", None)
+
+    scanner.init_data_feed(seed={"ABCD": QUALIFYING_QUOTE})
+    assert scanner.market_data["ABCD"] == QUALIFYING_QUOTE
+
+
+def test_snapshot_plus_replay_reproduces_live_state(tmp_path, monkeypatch):
+    """Replaying the feed from a snapshot's offset should rebuild the live quotes."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    feed_file.write_text("", encoding="utf-8")
+    _use_feed(monkeypatch, feed_file)
+
+    def append(*messages):
+        with open(feed_file, "a", encoding="utf-8") as handle:
+            for message in messages:
+                handle.write(json.dumps(message) + "\n")
+
+    scanner.init_data_feed()
+    try:
+        append({"symbol": "AB", "price": 2.0, "volume": 10}, {"symbol": "CD", "price": 3.0})
+        _wait_for_offset(feed_file.stat().st_size)
+        offset, snapshot = scanner.snapshot_market_data()
+
+        append({"symbol": "AB", "price": 2.5}, {"symbol": "EF", "price": 4.0, "news": True})
+        _wait_for_offset(feed_file.stat().st_size)
+        live = scanner.snapshot_market_data()[1]
+    finally:
+        scanner.stop_data_feed()
+
+    monkeypatch.setattr(scanner, "market_data", snapshot)
+    scanner._replay_data_file(str(feed_file), offset)
+    assert scanner.market_data == live
+
+
+def test_checkpointer_stop_writes_final_checkpoint(tmp_path):
+    """Stopping the background writer should flush the latest state to disk."""
+
+    state = {"watchlist": []}
+    path = checkpoint.checkpoint_path(tmp_path)
+    writer = checkpoint.Checkpointer(path, lambda: dict(state), interval=3600)
+    writer.start()
+    state["watchlist"] = ["ABCD"]
+    writer.stop()
+
+    assert checkpoint.load_checkpoint(path) == {"watchlist": ["ABCD"]}
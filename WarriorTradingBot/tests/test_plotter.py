@@ -0,0 +1,76 @@
+"""Tests for chart downsampling and batch rendering helpers."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..src.utils import plotter
+
+
+def test_lttb_keeps_endpoints_and_spike():
+    """Downsampling should keep the first/last points and a lone spike."""
+
+    y = np.zeros(10_000)
+    y[4321] = 50.0
+    x = np.arange(len(y))
+
+    sampled_x, sampled_y = plotter.lttb_downsample(x, y, 100)
+
+    assert len(sampled_x) == 100
+    assert sampled_x[0] == 0 and sampled_x[-1] == len(y) - 1
+    assert sampled_y.max() == 50.0
+
+
+def test_aggregate_ohlcv_merges_adjacent_bars():
+    """Merged bars should keep first open, extreme high/low, last close, and summed volume."""
+
+    data = pd.DataFrame(
+        {
+            "open": [1.0, 2.0, 3.0, 4.0],
+            "high": [1.5, 2.5, 3.5, 4.5],
+            "low": [0.5, 1.5, 2.5, 3.5],
+            "close": [2.0, 3.0, 4.0, 5.0],
+            "volume": [10, 20, 30, 40],
+        }
+    )
+
+    merged = plotter.aggregate_ohlcv(data, max_bars=2)
+
+    assert merged["open"].tolist() == [1.0, 3.0]
+    assert merged["high"].tolist() == [2.5, 4.5]
+    assert merged["low"].tolist() == [0.5, 2.5]
+    assert merged["close"].tolist() == [3.0, 5.0]
+    assert merged["volume"].tolist() == [30.0, 70.0]
+
+
+def test_aggregate_ohlcv_rejects_non_positive_max_bars():
+    """A non-positive bar budget should fail with a clear ValueError."""
+
+    data = pd.DataFrame({"open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [1]})
+
+    with pytest.raises(ValueError, match="max_bars"):
+        plotter.aggregate_ohlcv(data, max_bars=0)
+
+
+def test_render_charts_writes_png_files(tmp_path):
+    """Batch rendering should produce one PNG per job in job order."""
+
+    sample = pd.DataFrame(
+        {
+            "timestamp": ["09:30", "09:31", "09:32"],
+            "open": [2.5, 2.75, 2.85],
+            "high": [2.8, 2.9, 3.1],
+            "low": [2.45, 2.6, 2.8],
+            "close": [2.75, 2.85, 3.05],
+            "volume": [1_500_000, 1_200_000, 1_800_000],
+        }
+    )
+    jobs = [
+        plotter.ChartJob("equity", np.random.default_rng(0).normal(size=50_000), "equity.png"),
+        plotter.ChartJob("candlestick", sample, "candles.png", title="ABCD"),
+    ]
+
+    paths = plotter.render_charts(jobs, tmp_path, processes=2)
+
+    assert [path.name for path in paths] == ["equity.png", "candles.png"]
+    assert all(path.read_bytes().startswith(b"\x89PNG") for path in paths)
@@ -20,3 +20,16 @@ def test_halt_after_three_losses():
     manager.register_trade(-0.01)
     manager.register_trade(-0.01)
     assert manager.check_should_halt() is True
+
+
+def test_state_round_trip():
+    """Loss counters should survive a get_state/set_state round trip."""
+
+    manager = RiskManager(config)
+    manager.register_trade(-0.02)
+    manager.register_trade(-0.01)
+
+    restored = RiskManager(config)
+    restored.set_state(manager.get_state())
+    assert restored.daily_loss == manager.daily_loss
+    assert restored.consecutive_losses == 2
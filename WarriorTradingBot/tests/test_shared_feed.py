@@ -0,0 +1,128 @@
+"""Tests for sharded shared-memory feed ingestion."""
+
+import json
+
+from ..src import shared_feed
+
+
+def _write_feed(path, messages):
+    with open(path, "w", encoding="utf-8") as handle:
+        for message in messages:
+            handle.write(json.dumps(message) + "\n")
+
+
+def test_sharded_feed_matches_single_threaded_merge(tmp_path):
+    """Workers together should publish the same quotes as a sequential merge."""
+
+    messages = [
+        {"symbol": f"T{index % 7}", "price": 2 + index / 10, "prev_close": 2.0, "volume": index * 100, "news": index % 2 == 0}
+        for index in range(50)
+    ]
+    messages.append({"symbol": "T1", "price": 9.5})
+    feed_file = tmp_path / "feed.jsonl"
+    _write_feed(feed_file, messages)
+
+    expected = {}
+    for message in messages:
+        shared_feed.merge_quote(expected.setdefault(message["symbol"], {}), message)
+
+    feed = shared_feed.ShardedFeed(str(feed_file), workers=3, slots_per_worker=8, start_offset=0, follow=False)
+    try:
+        feed.start()
+        feed.join(timeout=10)
+        assert feed.processed() == len(messages)
+        assert dict(feed.market_data) == expected
+    finally:
+        feed.stop()
+
+
+def test_shard_for_is_stable_and_in_range():
+    """Partitioning must be deterministic across processes and cover every shard index."""
+
+    shards = {shared_feed.shard_for(f"SYM{index}", 4) for index in range(100)}
+    assert shards == {0, 1, 2, 3}
+    assert shared_feed.shard_for("ABCD", 4) == shared_feed.shard_for("ABCD", 4)
+
+
+def test_invalid_payloads_do_not_stop_the_shard(tmp_path):
+    """Non-object lines and unparseable fields are skipped without killing the worker."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    feed_file.write_text(
+        '[{"symbol": "AB"}]\n'
+        '{"symbol": "AB", "price": "n/a"}\n'
+        '{"symbol": "AB", "price": 3.5}\n'
+        '{"symbol": "CD", "price": 1.25}',
+        encoding="utf-8",
+    )
+
+    feed = shared_feed.ShardedFeed(str(feed_file), workers=1, slots_per_worker=4, start_offset=0, follow=False)
+    try:
+        feed.start()
+        feed.join(timeout=10)
+        assert feed.processed() == 2
+        assert feed.market_data["AB"]["price"] == 3.5
+        assert feed.market_data["CD"]["price"] == 1.25
+    finally:
+        feed.stop()
+
+
+def test_read_returns_stale_quote_when_writer_died_mid_update(tmp_path):
+    """A slot left with an odd sequence number must not make readers spin forever."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    _write_feed(feed_file, [{"symbol": "AB", "price": 2.5}])
+
+    feed = shared_feed.ShardedFeed(str(feed_file), workers=1, slots_per_worker=4, start_offset=0, follow=False)
+    try:
+        feed.start()
+        feed.join(timeout=10)
+        feed._layout.seq[0] += 1  # simulate a writer killed between its two increments
+        assert feed.market_data["AB"]["price"] == 2.5
+    finally:
+        feed.stop()
+
+
+def test_escaped_and_non_ascii_symbols_match_sequential_merge(tmp_path):
+    """Escaped and raw UTF-8 symbols should be routed and stored like any other."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    lines = [
+        '{"symbol": "A\\u0042", "price": 2.0}',
+        '{"symbol": "\\u00c9Z", "price": 3.0, "news": true}',
+        '{"symbol": "ÉZ", "volume": 500}',
+        '{"symbol": "AB", "prev_close": 1.5}',
+        '{"type": "symbol", "symbol": "CD", "price": 4.0}',
+    ]
+    feed_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    expected = {}
+    for line in lines:
+        message = json.loads(line)
+        shared_feed.merge_quote(expected.setdefault(message["symbol"], {}), message)
+
+    feed = shared_feed.ShardedFeed(str(feed_file), workers=3, slots_per_worker=4, start_offset=0, follow=False)
+    try:
+        feed.start()
+        feed.join(timeout=10)
+        assert feed.processed() == len(lines)
+        assert dict(feed.market_data) == expected
+        assert feed.market_data["ÉZ"]["volume"] == 500.0
+    finally:
+        feed.stop()
+
+
+def test_full_shard_warns_once_per_dropped_symbol(tmp_path, caplog):
+    """Repeated updates for a symbol that does not fit should log a single warning."""
+
+    feed_file = tmp_path / "feed.jsonl"
+    _write_feed(feed_file, [{"symbol": "AB", "price": 1.0}] + [{"symbol": "CD", "price": 2.0}] * 5)
+
+    feed = shared_feed.ShardedFeed(str(feed_file), workers=1, slots_per_worker=1, start_offset=0, follow=False)
+    try:
+        with caplog.at_level("WARNING", logger=shared_feed.logger.name):
+            shared_feed._worker(feed._shm.name, 0, 1, 1, str(feed_file), 0, False, feed._stop_event)
+        assert len([record for record in caplog.records if "CD" in record.getMessage()]) == 1
+        assert list(feed.market_data) == ["AB"]
+    finally:
+        feed.stop()